@@ -4,22 +4,128 @@ GitHub Repository Finder - Web Application
 Flask-based web interface for searching GitHub repositories
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 import os
 import csv
-import json
-import io
+import hashlib
 import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import orjson
+
 import github_search
 import presets
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson for faster request/response handling."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        # Request bodies arrive as bytes, which orjson parses without decoding
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes to the response directly instead of going through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default),
+            mimetype=self.mimetype
+        )
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Get GitHub token from environment
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 
+# Column order for CSV exports
+CSV_HEADERS = [
+    'name', 'full_name', 'owner', 'stars', 'forks', 'language',
+    'description', 'url', 'topics', 'created_at', 'pushed_at',
+    'archived', 'open_issues', 'watchers', 'license'
+]
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back."""
+
+    def write(self, value):
+        return value
+
+
+def _validate_export_rows(repositories):
+    """
+    Check export rows up front, since CSV rows are only built once
+    the streamed response has already started.
+
+    Raises:
+        ValueError: If repositories is not a list of repository objects
+    """
+    if not isinstance(repositories, list):
+        raise ValueError("'repositories' must be a list")
+
+    for repo in repositories:
+        if not isinstance(repo, dict):
+            raise ValueError("Each repository must be an object")
+        topics = repo.get('topics')
+        if topics and not (isinstance(topics, list) and all(isinstance(t, str) for t in topics)):
+            raise ValueError("Repository 'topics' must be a list of strings")
+
+
+def _csv_row(repo):
+    """Build a CSV row in CSV_HEADERS order; topics become a comma-separated string."""
+    return (
+        repo.get('name', ''),
+        repo.get('full_name', ''),
+        repo.get('owner', ''),
+        repo.get('stars', ''),
+        repo.get('forks', ''),
+        repo.get('language', ''),
+        repo.get('description', ''),
+        repo.get('url', ''),
+        ', '.join(repo.get('topics') or ()),
+        repo.get('created_at', ''),
+        repo.get('pushed_at', ''),
+        repo.get('archived', ''),
+        repo.get('open_issues', ''),
+        repo.get('watchers', ''),
+        repo.get('license', '')
+    )
+
+
+# Browser cache lifetime (seconds) for endpoints whose payload never changes
+STATIC_CACHE_MAX_AGE = 3600
+
+
+def _static_json(payload):
+    """Serialize a constant payload once and compute its ETag."""
+    body = orjson.dumps(payload, default=app.json.default)
+    return body, hashlib.sha1(body).hexdigest()
+
+
+def _static_json_response(static_json):
+    """Build a cacheable response for a pre-serialized payload."""
+    body, etag = static_json
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_CACHE_MAX_AGE
+    return response.make_conditional(request)
+
+
+# Presets and time periods are fixed at startup, so serialize them once
+_PRESETS_JSON = _static_json({"success": True, "presets": presets.get_presets_catalog()})
+_TIME_PERIODS_JSON = _static_json({
+    "success": True,
+    "time_periods": list(github_search.TIME_PERIODS.keys())
+})
+
 
 @app.route('/')
 def index():
@@ -30,10 +136,102 @@ def index():
 @app.route('/api/presets', methods=['GET'])
 def get_presets():
     """Get all predefined search presets."""
-    return jsonify({
+    return _static_json_response(_PRESETS_JSON)
+
+
+# Maximum number of searches in one batch. Batch searches are never
+# prefetched, so each costs at most one GitHub Search API call.
+MAX_BATCH_SIZE = 10
+
+# Bounded pool that runs the searches of a batch concurrently
+_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="batch")
+
+
+def _run_search(data, prefetch=True):
+    """
+    Run one search request body and return (payload, status_code).
+
+    Shared by the single and batch search endpoints; batch entries pass
+    prefetch=False so a batch never spends extra Search API quota.
+    """
+    # Parse topics (can be comma-separated string or list)
+    topics = data.get('topics', [])
+    if isinstance(topics, str):
+        topics = [t.strip() for t in topics.split(',') if t.strip()]
+
+    # Parse time period
+    since = data.get('since')
+    since_date = github_search.parse_time_period(since) if since else None
+
+    # Build search query
+    query = github_search.build_search_query(
+        language=data.get('language'),
+        topics=topics,
+        min_stars=data.get('min_stars'),
+        max_stars=data.get('max_stars'),
+        since_date=since_date,
+        exclude_archived=data.get('exclude_archived', False),
+        exclude_forks=data.get('exclude_forks', False)
+    )
+
+    if not query:
+        return {
+            "success": False,
+            "error": "At least one search criterion must be specified"
+        }, 400
+
+    # Fetch repositories
+    num_repos = data.get('num_repos') or 10
+    sort_by = data.get('sort_by') or 'stars'
+    page = data.get('page') or 1
+    seed = data.get('seed')
+
+    # Use token from request if provided, otherwise fall back to env var
+    token_to_use = data.get('github_token') or GITHUB_TOKEN
+
+    # Generate a new seed if not provided and it's the first page
+    if seed is None and page == 1:
+        seed = random.randint(0, 1000000)
+
+    result = github_search.fetch_repositories(
+        query=query,
+        num_repos=num_repos,
+        github_token=token_to_use,
+        sort_by=sort_by,
+        page=page,
+        seed=seed
+    )
+
+    if not result['success']:
+        return result, 500
+
+    # Warm the cache for the page the user is most likely to ask for next
+    if prefetch and result.get('has_more'):
+        github_search.prefetch_next_page(
+            query=query,
+            num_repos=num_repos,
+            github_token=token_to_use,
+            sort_by=sort_by,
+            page=page,
+            seed=seed
+        )
+
+    # Format repositories
+    formatted_repos = [
+        github_search.format_repository(repo)
+        for repo in result['repos']
+    ]
+
+    return {
         "success": True,
-        "presets": presets.get_all_presets()
-    })
+        "query": query,
+        "total_count": result['total_count'],
+        "returned_count": len(formatted_repos),
+        "repositories": formatted_repos,
+        "seed": result.get('seed'),
+        "page": result.get('page', 1),
+        "has_more": result.get('has_more', False)
+    }, 200
 
 
 @app.route('/api/search', methods=['POST'])
@@ -55,75 +253,58 @@ def search_repositories():
     }
     """
     try:
-        data = request.get_json()
+        payload, status = _run_search(request.get_json())
+        return jsonify(payload), status
 
-        # Parse topics (can be comma-separated string or list)
-        topics = data.get('topics', [])
-        if isinstance(topics, str):
-            topics = [t.strip() for t in topics.split(',') if t.strip()]
-
-        # Parse time period
-        since = data.get('since')
-        since_date = github_search.parse_time_period(since) if since else None
-
-        # Build search query
-        query = github_search.build_search_query(
-            language=data.get('language'),
-            topics=topics,
-            min_stars=data.get('min_stars'),
-            max_stars=data.get('max_stars'),
-            since_date=since_date,
-            exclude_archived=data.get('exclude_archived', False),
-            exclude_forks=data.get('exclude_forks', False)
-        )
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
 
-        if not query:
-            return jsonify({
-                "success": False,
-                "error": "At least one search criterion must be specified"
-            }), 400
 
-        # Fetch repositories
-        num_repos = data.get('num_repos', 10)
-        sort_by = data.get('sort_by', 'stars')
-        page = data.get('page', 1)
-        seed = data.get('seed')
+@app.route('/api/search/batch', methods=['POST'])
+def search_repositories_batch():
+    """
+    Run several searches in a single request.
 
-        # Use token from request if provided, otherwise fall back to env var
-        client_token = data.get('github_token')
-        token_to_use = client_token if client_token else GITHUB_TOKEN
+    Expected JSON body:
+    {
+        "requests": [
+            {"language": "python", "num_repos": 5},
+            {"language": "go", "num_repos": 5}
+        ]
+    }
 
-        # Generate a new seed if not provided and it's the first page
-        if seed is None and page == 1:
-            seed = random.randint(0, 1000000)
+    Each entry in "responses" is the body /api/search would return
+    for the corresponding request, in the same order.
+    """
+    try:
+        data = request.get_json()
+        searches = data.get('requests')
 
-        result = github_search.fetch_repositories(
-            query=query,
-            num_repos=num_repos,
-            github_token=token_to_use,
-            sort_by=sort_by,
-            page=page,
-            seed=seed
-        )
+        if not isinstance(searches, list) or not searches:
+            return jsonify({
+                "success": False,
+                "error": "'requests' must be a non-empty list of search bodies"
+            }), 400
 
-        if not result['success']:
-            return jsonify(result), 500
+        if len(searches) > MAX_BATCH_SIZE:
+            return jsonify({
+                "success": False,
+                "error": f"A batch may contain at most {MAX_BATCH_SIZE} searches"
+            }), 400
 
-        # Format repositories
-        formatted_repos = [
-            github_search.format_repository(repo)
-            for repo in result['repos']
-        ]
+        def run(search):
+            try:
+                payload, _ = _run_search(search, prefetch=False)
+            except Exception as e:
+                payload = {"success": False, "error": str(e)}
+            return payload
 
         return jsonify({
             "success": True,
-            "query": query,
-            "total_count": result['total_count'],
-            "returned_count": len(formatted_repos),
-            "repositories": formatted_repos,
-            "seed": result.get('seed'),
-            "page": result.get('page', 1),
-            "has_more": result.get('has_more', False)
+            "responses": list(_BATCH_EXECUTOR.map(run, searches))
         })
 
     except Exception as e:
@@ -139,24 +320,21 @@ def export_json():
     try:
         data = request.get_json()
         repositories = data.get('repositories', [])
+        now = datetime.now()
 
-        # Create JSON file
-        json_data = json.dumps({
-            "exported_at": datetime.now().isoformat(),
+        # Create JSON file (orjson already returns UTF-8 bytes)
+        json_data = orjson.dumps({
+            "exported_at": now.isoformat(),
             "count": len(repositories),
             "repositories": repositories
-        }, indent=2)
+        }, option=orjson.OPT_INDENT_2)
 
-        # Create in-memory file
-        buffer = io.BytesIO()
-        buffer.write(json_data.encode('utf-8'))
-        buffer.seek(0)
+        filename = f'github_repos_{now.strftime("%Y%m%d_%H%M%S")}.json'
 
-        return send_file(
-            buffer,
+        return Response(
+            json_data,
             mimetype='application/json',
-            as_attachment=True,
-            download_name=f'github_repos_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
         )
 
     except Exception as e:
@@ -172,38 +350,25 @@ def export_csv():
     try:
         data = request.get_json()
         repositories = data.get('repositories', [])
+        _validate_export_rows(repositories)
 
-        # Create CSV in memory
-        output = io.StringIO()
+        filename = f'github_repos_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
 
-        if repositories:
-            # Define CSV headers
-            headers = [
-                'name', 'full_name', 'owner', 'stars', 'forks', 'language',
-                'description', 'url', 'topics', 'created_at', 'pushed_at',
-                'archived', 'open_issues', 'watchers', 'license'
-            ]
+        # Stream rows straight to the client instead of buffering the file
+        writer = csv.writer(_Echo())
 
-            writer = csv.DictWriter(output, fieldnames=headers, extrasaction='ignore')
-            writer.writeheader()
+        def generate():
+            if not repositories:
+                return
 
-            # Write data
+            yield writer.writerow(CSV_HEADERS).encode('utf-8')
             for repo in repositories:
-                # Convert topics list to comma-separated string
-                repo_copy = repo.copy()
-                repo_copy['topics'] = ', '.join(repo.get('topics', []))
-                writer.writerow(repo_copy)
-
-        # Create bytes buffer from string
-        buffer = io.BytesIO()
-        buffer.write(output.getvalue().encode('utf-8'))
-        buffer.seek(0)
-
-        return send_file(
-            buffer,
+                yield writer.writerow(_csv_row(repo)).encode('utf-8')
+
+        return Response(
+            generate(),
             mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'github_repos_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
         )
 
     except Exception as e:
@@ -216,10 +381,7 @@ def export_csv():
 @app.route('/api/time-periods', methods=['GET'])
 def get_time_periods():
     """Get available time period options."""
-    return jsonify({
-        "success": True,
-        "time_periods": list(github_search.TIME_PERIODS.keys())
-    })
+    return _static_json_response(_TIME_PERIODS_JSON)
 
 
 if __name__ == '__main__':
@@ -9,20 +9,15 @@ import sys
 import requests
 import argparse
 import random
+import orjson
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict
 
-# Time period mappings
-TIME_PERIODS = {
-    "1week": 7,
-    "2weeks": 14,
-    "1month": 30,
-    "3months": 90,
-    "6months": 180,
-    "1year": 365,
-    "2years": 730,
-    "5years": 1825,
-}
+from github_session import make_session
+from time_periods import TIME_PERIODS
+
+# Shared HTTP session so TCP/TLS connections to the GitHub API are reused
+_SESSION = make_session()
 
 
 def parse_time_period(period_str: str) -> Optional[str]:
@@ -132,9 +127,9 @@ def fetch_repositories(
     }
 
     try:
-        response = requests.get(base_url, params=params, headers=headers, timeout=10)
+        response = _SESSION.get(base_url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         # Check for API rate limit
         if response.status_code == 403:
@@ -151,11 +146,10 @@ def fetch_repositories(
         if len(repos) < num_repos:
             print(f"Note: Only {len(repos)} repositories found (requested {num_repos})")
 
-        # Shuffle for randomness and select requested number
-        random.shuffle(repos)
-        return repos[:num_repos]
+        # Randomly select the requested number without shuffling the whole page
+        return random.sample(repos, k=min(num_repos, len(repos)))
 
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         print(f"Error fetching repositories: {e}")
         sys.exit(1)
 
@@ -6,22 +6,110 @@ Core search functionality for GitHub API
 
 import os
 import sys
+import functools
+import hashlib
+import logging
+import operator
+import threading
+import time
 import requests
 import random
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict
-
-# Time period mappings
-TIME_PERIODS = {
-    "1week": 7,
-    "2weeks": 14,
-    "1month": 30,
-    "3months": 90,
-    "6months": 180,
-    "1year": 365,
-    "2years": 730,
-    "5years": 1825,
-}
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+from datetime import date, datetime, timedelta
+from typing import Optional, List, Dict, Tuple
+
+from github_session import make_session
+from time_periods import TIME_PERIODS
+
+logger = logging.getLogger(__name__)
+
+
+# Shared HTTP session so TCP/TLS connections to the GitHub API are reused
+_SESSION = make_session()
+
+SEARCH_URL = "https://api.github.com/search/repositories"
+
+# GitHub API limits:
+# - Max 100 items per page
+# - Only the first 1000 search results are available
+MAX_PER_PAGE = 100
+MAX_RESULTS = 1000
+
+# Short-lived cache of raw search pages so repeated searches skip the API
+_RESULTS_CACHE = TTLCache(maxsize=1024, ttl=120)
+_RESULTS_CACHE_LOCK = threading.Lock()
+# Makes a caller wait for an identical fetch already in flight, such as a
+# prefetch of the page being requested, instead of calling GitHub again
+_RESULTS_CACHE_CONDITION = threading.Condition(_RESULTS_CACHE_LOCK)
+
+# Longer-lived (etag, items, total_count) entries used to revalidate expired
+# pages with If-None-Match instead of downloading them again. Kept small and
+# finite because each entry holds a whole page of results.
+_ETAG_CACHE = TTLCache(maxsize=128, ttl=900)
+_ETAG_CACHE_LOCK = threading.Lock()
+
+# Background workers that warm the cache with the next page of results
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="prefetch")
+
+# Prefetching spends Search API quota, so only do it while this much is left
+PREFETCH_MIN_REMAINING = 5
+
+# Last seen (remaining, reset_epoch) Search API quota, keyed by token hash
+_RATE_LIMITS = TTLCache(maxsize=1024, ttl=120)
+_RATE_LIMITS_LOCK = threading.Lock()
+
+
+# Required repository fields, fetched in one C-level call by format_repository
+_REQUIRED_REPO_FIELDS = operator.itemgetter(
+    'name', 'full_name', 'owner', 'stargazers_count', 'forks_count',
+    'html_url', 'created_at', 'updated_at', 'pushed_at'
+)
+
+
+# Top-level fields of a search item that format_repository reads
+_STORED_REPO_FIELDS = (
+    'name', 'full_name', 'stargazers_count', 'forks_count', 'html_url',
+    'created_at', 'updated_at', 'pushed_at', 'language', 'description',
+    'homepage', 'topics', 'archived', 'open_issues_count', 'watchers_count'
+)
+
+
+@dataclass(slots=True)
+class Repository:
+    """Repository record returned by the search API; orjson serializes it natively."""
+
+    name: str
+    full_name: str
+    owner: str
+    stars: int
+    forks: int
+    language: Optional[str]
+    description: Optional[str]
+    url: str
+    homepage: Optional[str]
+    topics: List[str]
+    created_at: str
+    updated_at: str
+    pushed_at: str
+    archived: bool
+    open_issues: int
+    watchers: int
+    license: str
+
+
+class GitHubAPIError(Exception):
+    """Raised when the GitHub API rejects a search request."""
+
+
+@functools.lru_cache(maxsize=64)
+def _period_start(period: str, today_ordinal: int) -> str:
+    """Resolve a predefined period to its start date; cached per calendar day."""
+    days_ago = TIME_PERIODS[period]
+    return (date.fromordinal(today_ordinal) - timedelta(days=days_ago)).isoformat()
 
 
 def parse_time_period(period_str: str) -> Optional[str]:
@@ -38,10 +126,9 @@ def parse_time_period(period_str: str) -> Optional[str]:
         return None
 
     # Check if it's a predefined period
-    if period_str.lower() in TIME_PERIODS:
-        days_ago = TIME_PERIODS[period_str.lower()]
-        target_date = datetime.now() - timedelta(days=days_ago)
-        return target_date.strftime("%Y-%m-%d")
+    period = period_str.lower()
+    if period in TIME_PERIODS:
+        return _period_start(period, date.today().toordinal())
 
     # Try to parse as exact date
     try:
@@ -75,35 +162,287 @@ def build_search_query(
     Returns:
         Formatted query string for GitHub API
     """
-    query_parts = []
-
-    if language:
-        query_parts.append(f"language:{language}")
-
-    # Add topics
-    if topics:
-        for topic in topics:
-            if topic.strip():
-                query_parts.append(f"topic:{topic.strip()}")
-
     # Build stars range
     if min_stars is not None and max_stars is not None:
-        query_parts.append(f"stars:{min_stars}..{max_stars}")
+        stars = f"stars:{min_stars}..{max_stars}"
     elif min_stars is not None:
-        query_parts.append(f"stars:>={min_stars}")
+        stars = f"stars:>={min_stars}"
     elif max_stars is not None:
-        query_parts.append(f"stars:<={max_stars}")
+        stars = f"stars:<={max_stars}"
+    else:
+        stars = None
 
-    if since_date:
-        query_parts.append(f"pushed:>={since_date}")
+    # Unused filters are None and dropped in a single pass by the join
+    query_parts = (
+        f"language:{language}" if language else None,
+        *(f"topic:{topic}" for topic in (t.strip() for t in topics or ()) if topic),
+        stars,
+        f"pushed:>={since_date}" if since_date else None,
+        "archived:false" if exclude_archived else None,
+        "fork:false" if exclude_forks else None,
+    )
 
-    if exclude_archived:
-        query_parts.append("archived:false")
+    return " ".join(part for part in query_parts if part)
 
-    if exclude_forks:
-        query_parts.append("fork:false")
 
-    return " ".join(query_parts)
+def _token_hash(github_token: Optional[str]) -> Optional[str]:
+    """Hash a token so it can be used in cache keys without storing it."""
+    if not github_token:
+        return None
+    return hashlib.sha256(github_token.encode("utf-8")).hexdigest()
+
+
+def _slim_repository(item: Dict) -> Dict:
+    """
+    Keep only the fields format_repository reads from a raw search item.
+
+    Raw items carry dozens of API URLs and a full owner object, which would
+    otherwise sit in the results caches for every cached page.
+    """
+    slim = {field: item[field] for field in _STORED_REPO_FIELDS if field in item}
+    slim['owner'] = {'login': item['owner']['login']}
+    license_info = item.get('license')
+    slim['license'] = {'name': license_info.get('name', 'N/A')} if license_info else None
+    return slim
+
+
+def _record_rate_limit(github_token: Optional[str], response: requests.Response) -> None:
+    """Remember the quota GitHub reported for this token (or anonymous use)."""
+    try:
+        limit = (
+            int(response.headers["X-RateLimit-Remaining"]),
+            int(response.headers["X-RateLimit-Reset"])
+        )
+    except (KeyError, ValueError):
+        return
+
+    with _RATE_LIMITS_LOCK:
+        _RATE_LIMITS[_token_hash(github_token)] = limit
+
+
+def _has_spare_quota(github_token: Optional[str]) -> bool:
+    """Check whether a background fetch can be afforded without risking a 403."""
+    with _RATE_LIMITS_LOCK:
+        limit = _RATE_LIMITS.get(_token_hash(github_token))
+
+    if limit is None:
+        # No recent quota seen; only authenticated requests have room to spare
+        return bool(github_token)
+
+    remaining, reset = limit
+    return remaining >= PREFETCH_MIN_REMAINING or time.time() >= reset
+
+
+def _log_prefetch_failure(future) -> None:
+    """Log prefetch errors, which would otherwise vanish with the future."""
+    error = future.exception()
+    if error is not None:
+        logger.warning("Prefetching search results failed: %s", error)
+
+
+def _fetch_raw_key(
+    query: str,
+    sort_by: str,
+    per_page: int,
+    github_page: int,
+    github_token: Optional[str] = None
+):
+    return hashkey(query, sort_by, per_page, github_page, _token_hash(github_token))
+
+
+@cached(_RESULTS_CACHE, key=_fetch_raw_key, lock=_RESULTS_CACHE_LOCK, condition=_RESULTS_CACHE_CONDITION)
+def _fetch_raw(
+    query: str,
+    sort_by: str,
+    per_page: int,
+    github_page: int,
+    github_token: Optional[str] = None
+) -> Tuple[Tuple[Dict, ...], int]:
+    """
+    Fetch a single page of search results from the GitHub API.
+
+    Successful responses are cached for a short time, keeping only the
+    fields format_repository reads; errors are not cached. Concurrent
+    calls for the same page share a single request.
+    Once a page expires it is revalidated with its ETag, and a 304 reply
+    reuses the previously downloaded results.
+
+    Args:
+        query: Search query string
+        sort_by: Sort criteria (stars, forks, updated)
+        per_page: Number of results per GitHub page
+        github_page: GitHub page number to fetch (1-based)
+        github_token: Optional GitHub personal access token
+
+    Returns:
+        Tuple of (items, total_count)
+
+    Raises:
+        GitHubAPIError: If the API rejects the request (rate limit, bad token)
+        requests.exceptions.RequestException: On network or HTTP errors
+    """
+    headers = {}
+    if github_token:
+        headers["Authorization"] = f"token {github_token}"
+
+    cache_key = _fetch_raw_key(query, sort_by, per_page, github_page, github_token)
+    with _ETAG_CACHE_LOCK:
+        validated = _ETAG_CACHE.get(cache_key)
+    if validated:
+        headers["If-None-Match"] = validated[0]
+
+    params = {
+        "q": query,
+        "sort": sort_by,
+        "order": "desc",
+        "per_page": per_page,
+        "page": github_page
+    }
+
+    response = _SESSION.get(SEARCH_URL, params=params, headers=headers, timeout=10)
+    _record_rate_limit(github_token, response)
+
+    # Check for API rate limit or unauthorized
+    if response.status_code == 403:
+        raise GitHubAPIError("GitHub API rate limit exceeded. Consider using a GitHub token.")
+    elif response.status_code == 401:
+        raise GitHubAPIError("Invalid GitHub Token. Please check your token and try again.")
+    elif response.status_code == 304 and validated:
+        # Store the entry again so a page that keeps revalidating stays cached
+        with _ETAG_CACHE_LOCK:
+            _ETAG_CACHE[cache_key] = validated
+        return validated[1], validated[2]
+
+    response.raise_for_status()
+    data = orjson.loads(response.content)
+
+    items = tuple(_slim_repository(item) for item in data.get("items", []))
+    total_count = data.get("total_count", 0)
+
+    etag = response.headers.get("ETag")
+    if etag:
+        with _ETAG_CACHE_LOCK:
+            _ETAG_CACHE[cache_key] = (etag, items, total_count)
+
+    return items, total_count
+
+
+def _page_layout(num_repos: int) -> Tuple[int, int, int, int]:
+    """
+    Return (page_size, per_page, pages_per_github_page, max_pages) for a page size.
+
+    GitHub is queried with the largest multiple of the page size that fits
+    in MAX_PER_PAGE, so one cached GitHub page serves several consecutive
+    user-facing pages and every result lands on exactly one of them.
+    """
+    page_size = min(MAX_PER_PAGE, num_repos)
+    pages_per_github_page = MAX_PER_PAGE // page_size
+    per_page = page_size * pages_per_github_page
+    max_pages = (MAX_RESULTS // per_page) * pages_per_github_page
+    return page_size, per_page, pages_per_github_page, max_pages
+
+
+def _feistel(value: int, half_bits: int, seed: int) -> int:
+    """
+    Apply a 4-round balanced Feistel network to a 2 * half_bits wide value.
+
+    Every round is keyed by the seed, so each seed gives a different
+    permutation of [0, 2 ** (2 * half_bits)).
+    """
+    mask = (1 << half_bits) - 1
+    left, right = value >> half_bits, value & mask
+
+    for round_num in range(4):
+        digest = hashlib.blake2b(f"{seed}:{round_num}:{right}".encode("utf-8"), digest_size=4).digest()
+        left, right = right, left ^ (int.from_bytes(digest, "big") & mask)
+
+    return (left << half_bits) | right
+
+
+def _permuted_index(index: int, size: int, seed: int) -> int:
+    """Map index to its position in a seeded permutation of range(size)."""
+    # Smallest even bit width covering size, so the network is balanced
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+
+    # Cycle-walk until the output lands back inside range(size)
+    value = _feistel(index, half_bits, seed)
+    while value >= size:
+        value = _feistel(value, half_bits, seed)
+
+    return value
+
+
+def _locate_page(
+    page: int,
+    num_repos: int,
+    seed: Optional[int]
+) -> Optional[Tuple[int, int, int]]:
+    """
+    Map a user-facing page number to where its results live on GitHub.
+
+    Args:
+        page: Current page number (1-based)
+        num_repos: Number of repositories per page
+        seed: Random seed for consistent page shuffling
+
+    Returns:
+        Tuple of (page_index, github_page, offset), or None if the page
+        is past the end
+    """
+    page_size, _, pages_per_github_page, max_pages = _page_layout(num_repos)
+
+    if page > max_pages:
+        return None
+
+    if seed is None:
+        # Default behavior (no randomization across pages)
+        page_index = page - 1
+    else:
+        # Deterministic shuffle of page numbers, computed for just this page
+        page_index = _permuted_index(page - 1, max_pages, seed)
+
+    github_page, slot = divmod(page_index, pages_per_github_page)
+    return page_index, github_page + 1, slot * page_size
+
+
+def prefetch_next_page(
+    query: str,
+    num_repos: int,
+    github_token: Optional[str] = None,
+    sort_by: str = "stars",
+    page: int = 1,
+    seed: Optional[int] = None
+) -> None:
+    """
+    Fetch the page after `page` in the background so it is cached
+    by the time the user asks for it.
+
+    Skipped unless the caller's last observed Search API quota has room
+    to spare, since each prefetch costs a real search request.
+
+    Args:
+        query: Search query string
+        num_repos: Number of repositories to fetch per page
+        github_token: Optional GitHub personal access token
+        sort_by: Sort criteria (stars, forks, updated)
+        page: Page number that was just served (1-based)
+        seed: Random seed for consistent page shuffling
+    """
+    current = _locate_page(page, num_repos, seed)
+    upcoming = _locate_page(page + 1, num_repos, seed)
+
+    # Nothing to do past the end or when both pages share a cached GitHub page
+    if upcoming is None or (current and current[1] == upcoming[1]):
+        return
+
+    if not _has_spare_quota(github_token):
+        return
+
+    _, per_page, _, _ = _page_layout(num_repos)
+    future = _PREFETCH_EXECUTOR.submit(
+        _fetch_raw, query, sort_by, per_page, upcoming[1], github_token
+    )
+    future.add_done_callback(_log_prefetch_failure)
 
 
 def fetch_repositories(
@@ -128,75 +467,28 @@ def fetch_repositories(
     Returns:
         Dictionary with 'success', 'repos', 'error', 'total_count', 'seed'
     """
-    base_url = "https://api.github.com/search/repositories"
+    page_size, per_page, _, max_pages = _page_layout(num_repos)
 
-    headers = {}
-    if github_token:
-        headers["Authorization"] = f"token {github_token}"
+    # Determine which actual GitHub page, and which slice of it, to serve
+    location = _locate_page(page, num_repos, seed)
 
-    # GitHub API limits:
-    # - Max 100 items per page
-    # - Only the first 1000 search results are available
-    per_page = min(100, num_repos)
-    max_results = 1000
-    max_pages = max_results // per_page
-
-    # Determine which actual GitHub page to fetch
-    if seed is not None:
-        # Create a deterministic shuffle of page numbers
-        pages = list(range(1, max_pages + 1))
-        rng = random.Random(seed)
-        rng.shuffle(pages)
-
-        # If requested page is out of bounds, we're done
-        if page > len(pages):
-            return {
-                "success": True,
-                "repos": [],
-                "total_count": 0,
-                "message": "No more results.",
-                "seed": seed
-            }
-
-        github_page = pages[page - 1]
-    else:
-        # Default behavior (no randomization across pages)
-        github_page = page
+    # If requested page is out of bounds, we're done
+    if location is None:
+        return {
+            "success": True,
+            "repos": [],
+            "total_count": 0,
+            "message": "No more results.",
+            "seed": seed
+        }
 
-    params = {
-        "q": query,
-        "sort": sort_by,
-        "order": "desc",
-        "per_page": per_page,
-        "page": github_page
-    }
+    page_index, github_page, offset = location
 
     try:
-        response = requests.get(base_url, params=params, headers=headers, timeout=10)
+        items, total_count = _fetch_raw(query, sort_by, per_page, github_page, github_token)
+        chunk = items[offset:offset + page_size]
 
-        # Check for API rate limit or unauthorized
-        if response.status_code == 403:
-            return {
-                "success": False,
-                "error": "GitHub API rate limit exceeded. Consider using a GitHub token.",
-                "repos": [],
-                "total_count": 0
-            }
-        elif response.status_code == 401:
-            return {
-                "success": False,
-                "error": "Invalid GitHub Token. Please check your token and try again.",
-                "repos": [],
-                "total_count": 0
-            }
-
-        response.raise_for_status()
-        data = response.json()
-
-        repos = data.get("items", [])
-        total_count = data.get("total_count", 0)
-
-        if not repos:
+        if not chunk:
             return {
                 "success": True,
                 "repos": [],
@@ -209,13 +501,14 @@ def fetch_repositories(
         # as much, but a little local shuffle doesn't hurt.
         # By shuffling the PAGES, we pick a random chunk of the 1000 results.
         # To make it feel even more random, we can shuffle the results within the page.
+        # sample() draws into a new list, so the cached page is never reordered.
         if seed is not None:
-             # Use a derived seed for this specific page to ensure consistency
-             # when re-fetching the same page (though we shouldn't need to)
-             page_rng = random.Random(seed + github_page)
-             page_rng.shuffle(repos)
+            # Use a derived seed for this specific page to ensure consistency
+            # when re-fetching the same page (though we shouldn't need to)
+            page_rng = random.Random(seed + page_index)
+            repos = page_rng.sample(chunk, len(chunk))
         else:
-             random.shuffle(repos)
+            repos = random.sample(chunk, len(chunk))
 
         return {
             "success": True,
@@ -224,10 +517,17 @@ def fetch_repositories(
             "query": query,
             "seed": seed,
             "page": page,
-            "has_more": page < max_pages and (page * per_page) < total_count
+            "has_more": page < max_pages and (page * page_size) < total_count
         }
 
-    except requests.exceptions.RequestException as e:
+    except GitHubAPIError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "repos": [],
+            "total_count": 0
+        }
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
         return {
             "success": False,
             "error": f"Error fetching repositories: {str(e)}",
@@ -236,7 +536,7 @@ def fetch_repositories(
         }
 
 
-def format_repository(repo: Dict) -> Dict:
+def format_repository(repo: Dict) -> Repository:
     """
     Format repository data for display/export.
 
@@ -244,24 +544,29 @@ def format_repository(repo: Dict) -> Dict:
         repo: Repository dictionary from GitHub API
 
     Returns:
-        Formatted repository dictionary
+        Formatted repository record
     """
-    return {
-        "name": repo['name'],
-        "full_name": repo['full_name'],
-        "owner": repo['owner']['login'],
-        "stars": repo['stargazers_count'],
-        "forks": repo['forks_count'],
-        "language": repo.get('language', 'N/A'),
-        "description": repo.get('description', ''),
-        "url": repo['html_url'],
-        "homepage": repo.get('homepage', ''),
-        "topics": repo.get('topics', []),
-        "created_at": repo['created_at'],
-        "updated_at": repo['updated_at'],
-        "pushed_at": repo['pushed_at'],
-        "archived": repo.get('archived', False),
-        "open_issues": repo.get('open_issues_count', 0),
-        "watchers": repo.get('watchers_count', 0),
-        "license": repo.get('license', {}).get('name', 'N/A') if repo.get('license') else 'N/A'
-    }
+    (name, full_name, owner, stars, forks,
+     url, created_at, updated_at, pushed_at) = _REQUIRED_REPO_FIELDS(repo)
+    get = repo.get
+    license_info = get('license')
+
+    return Repository(
+        name=name,
+        full_name=full_name,
+        owner=owner['login'],
+        stars=stars,
+        forks=forks,
+        language=get('language', 'N/A'),
+        description=get('description', ''),
+        url=url,
+        homepage=get('homepage', ''),
+        topics=get('topics', []),
+        created_at=created_at,
+        updated_at=updated_at,
+        pushed_at=pushed_at,
+        archived=get('archived', False),
+        open_issues=get('open_issues_count', 0),
+        watchers=get('watchers_count', 0),
+        license=license_info.get('name', 'N/A') if license_info else 'N/A'
+    )
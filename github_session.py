@@ -0,0 +1,24 @@
+"""
+HTTP session setup shared by the search modules
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def make_session() -> requests.Session:
+    """Create an HTTP session with pooled, retrying connections to the GitHub API."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    ))
+    session.headers.update({
+        "Accept": "application/vnd.github+json",
+        # Search payloads compress well; urllib3 decompresses gzip in C
+        "Accept-Encoding": "gzip",
+        "User-Agent": "repo-hunter"
+    })
+    return session
@@ -2,162 +2,282 @@
 Predefined search presets for quick access
 """
 
+import functools
+import sys
+from dataclasses import dataclass, field, fields
+from types import MappingProxyType
+from typing import FrozenSet, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class PresetConfig:
+    """Search settings applied when a preset is selected."""
+
+    language: Optional[str] = None
+    topics: Tuple[str, ...] = ()
+    min_stars: int = 0
+    since: Optional[str] = None
+    exclude_archived: bool = True
+    num_repos: int = 10
+    # Same topics as a set for O(1) membership tests; derived, not serialized
+    topics_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Intern repeated strings so presets share one object per value
+        object.__setattr__(self, "topics", tuple(sys.intern(topic) for topic in self.topics))
+        object.__setattr__(self, "topics_set", frozenset(self.topics))
+        if self.language:
+            object.__setattr__(self, "language", sys.intern(self.language))
+        if self.since:
+            object.__setattr__(self, "since", sys.intern(self.since))
+
+    def has_topic(self, topic: str) -> bool:
+        """Check whether the preset filters on the given topic."""
+        return topic in self.topics_set
+
+    def to_dict(self):
+        """Return the config as a dict, leaving out unset filters."""
+        values = ((f.name, getattr(self, f.name)) for f in fields(self) if f.init)
+        return {name: value for name, value in values if value not in (None, ())}
+
+
 PRESETS = [
     {
         "id": "trending-ai-ml",
         "name": "🤖 Trending AI/ML",
         "description": "Popular machine learning and AI projects",
-        "config": {
-            "language": "python",
-            "topics": ["machine-learning", "artificial-intelligence", "deep-learning"],
-            "min_stars": 1000,
-            "since": "6months",
-            "exclude_archived": True,
-            "num_repos": 10
-        }
+        "config": PresetConfig(
+            language="python",
+            topics=("machine-learning", "artificial-intelligence", "deep-learning"),
+            min_stars=1000,
+            since="6months",
+            exclude_archived=True,
+            num_repos=10
+        )
     },
     {
         "id": "web-frameworks",
         "name": "🌐 Popular Web Frameworks",
         "description": "Top web development frameworks",
-        "config": {
-            "topics": ["framework", "web", "frontend"],
-            "min_stars": 5000,
-            "exclude_archived": True,
-            "num_repos": 10
-        }
+        "config": PresetConfig(
+            topics=("framework", "web", "frontend"),
+            min_stars=5000,
+            exclude_archived=True,
+            num_repos=10
+        )
     },
     {
         "id": "devops-tools",
         "name": "🔧 Active DevOps Tools",
         "description": "Recently updated DevOps and infrastructure tools",
-        "config": {
-            "topics": ["devops", "kubernetes", "docker", "infrastructure"],
-            "min_stars": 500,
-            "since": "3months",
-            "exclude_archived": True,
-            "num_repos": 15
-        }
+        "config": PresetConfig(
+            topics=("devops", "kubernetes", "docker", "infrastructure"),
+            min_stars=500,
+            since="3months",
+            exclude_archived=True,
+            num_repos=15
+        )
     },
     {
         "id": "data-science",
         "name": "📊 Data Science Tools",
         "description": "Python data science and analytics tools",
-        "config": {
-            "language": "python",
-            "topics": ["data-science", "data-analysis", "analytics"],
-            "min_stars": 1000,
-            "exclude_archived": True,
-            "num_repos": 10
-        }
+        "config": PresetConfig(
+            language="python",
+            topics=("data-science", "data-analysis", "analytics"),
+            min_stars=1000,
+            exclude_archived=True,
+            num_repos=10
+        )
     },
     {
         "id": "awesome-lists",
         "name": "⭐ Awesome Lists",
         "description": "Curated lists of awesome resources",
-        "config": {
-            "topics": ["awesome", "awesome-list", "resources"],
-            "min_stars": 1000,
-            "since": "1year",
-            "exclude_archived": True,
-            "num_repos": 12
-        }
+        "config": PresetConfig(
+            topics=("awesome", "awesome-list", "resources"),
+            min_stars=1000,
+            since="1year",
+            exclude_archived=True,
+            num_repos=12
+        )
     },
     {
         "id": "game-dev",
         "name": "🎮 Game Development",
         "description": "Game engines and development tools",
-        "config": {
-            "topics": ["game", "gamedev", "game-engine"],
-            "min_stars": 100,
-            "since": "1year",
-            "exclude_archived": True,
-            "num_repos": 10
-        }
+        "config": PresetConfig(
+            topics=("game", "gamedev", "game-engine"),
+            min_stars=100,
+            since="1year",
+            exclude_archived=True,
+            num_repos=10
+        )
     },
     {
         "id": "rust-projects",
         "name": "🦀 Trending Rust",
         "description": "Popular and recent Rust projects",
-        "config": {
-            "language": "rust",
-            "min_stars": 500,
-            "since": "6months",
-            "exclude_archived": True,
-            "num_repos": 10
-        }
+        "config": PresetConfig(
+            language="rust",
+            min_stars=500,
+            since="6months",
+            exclude_archived=True,
+            num_repos=10
+        )
     },
     {
         "id": "go-backend",
         "name": "🐹 Go Backend Tools",
         "description": "Backend and API tools written in Go",
-        "config": {
-            "language": "go",
-            "topics": ["api", "backend", "microservices"],
-            "min_stars": 500,
-            "since": "6months",
-            "exclude_archived": True,
-            "num_repos": 10
-        }
+        "config": PresetConfig(
+            language="go",
+            topics=("api", "backend", "microservices"),
+            min_stars=500,
+            since="6months",
+            exclude_archived=True,
+            num_repos=10
+        )
     },
     {
         "id": "security-tools",
         "name": "🔒 Security Tools",
         "description": "Cybersecurity and pentesting tools",
-        "config": {
-            "topics": ["security", "cybersecurity", "pentesting", "hacking"],
-            "min_stars": 300,
-            "since": "1year",
-            "exclude_archived": True,
-            "num_repos": 15
-        }
+        "config": PresetConfig(
+            topics=("security", "cybersecurity", "pentesting", "hacking"),
+            min_stars=300,
+            since="1year",
+            exclude_archived=True,
+            num_repos=15
+        )
     },
     {
         "id": "mobile-apps",
         "name": "📱 Mobile Development",
         "description": "Mobile app development frameworks and tools",
-        "config": {
-            "topics": ["mobile", "android", "ios", "react-native", "flutter"],
-            "min_stars": 1000,
-            "exclude_archived": True,
-            "num_repos": 10
-        }
+        "config": PresetConfig(
+            topics=("mobile", "android", "ios", "react-native", "flutter"),
+            min_stars=1000,
+            exclude_archived=True,
+            num_repos=10
+        )
     },
     {
         "id": "cli-tools",
         "name": "⌨️ CLI Tools",
         "description": "Command-line utilities and tools",
-        "config": {
-            "topics": ["cli", "terminal", "command-line"],
-            "min_stars": 500,
-            "since": "1year",
-            "exclude_archived": True,
-            "num_repos": 12
-        }
+        "config": PresetConfig(
+            topics=("cli", "terminal", "command-line"),
+            min_stars=500,
+            since="1year",
+            exclude_archived=True,
+            num_repos=12
+        )
     },
     {
         "id": "blockchain",
         "name": "⛓️ Blockchain Projects",
         "description": "Blockchain and cryptocurrency projects",
-        "config": {
-            "topics": ["blockchain", "cryptocurrency", "web3"],
-            "min_stars": 500,
-            "since": "1year",
-            "exclude_archived": True,
-            "num_repos": 10
-        }
+        "config": PresetConfig(
+            topics=("blockchain", "cryptocurrency", "web3"),
+            min_stars=500,
+            since="1year",
+            exclude_archived=True,
+            num_repos=10
+        )
     }
 ]
 
 
+# Presets never change at runtime, so share them as immutable views
+PRESETS = tuple(MappingProxyType(preset) for preset in PRESETS)
+
+# Index for O(1) lookup by preset ID, built once at import
+_PRESETS_BY_ID = {preset["id"]: preset for preset in PRESETS}
+
+
+def _build_indexes():
+    """Build topic -> presets and language -> presets lookup tables."""
+    by_topic = {}
+    by_language = {}
+    for preset in PRESETS:
+        config = preset["config"]
+        for topic in config.topics:
+            by_topic.setdefault(topic, []).append(preset)
+        language = config.language
+        if language:
+            by_language.setdefault(language, []).append(preset)
+
+    return (
+        {topic: tuple(matches) for topic, matches in by_topic.items()},
+        {language: tuple(matches) for language, matches in by_language.items()},
+    )
+
+
+_BY_TOPIC, _BY_LANGUAGE = _build_indexes()
+
+
+# Plain-dict copy of the catalog that JSON encoders serialize without hooks
+_PRESETS_CATALOG = tuple({**preset, "config": preset["config"].to_dict()} for preset in PRESETS)
+
+
 def get_preset_by_id(preset_id: str):
     """Get preset configuration by ID."""
-    for preset in PRESETS:
-        if preset["id"] == preset_id:
-            return preset
-    return None
+    return _PRESETS_BY_ID.get(preset_id)
 
 
 def get_all_presets():
     """Get all available presets."""
     return PRESETS
+
+
+def get_presets_catalog():
+    """Get all available presets as plain, JSON-serializable dicts."""
+    return _PRESETS_CATALOG
+
+
+def get_presets_by_topic(topic: str):
+    """Get presets that include the given topic."""
+    return _BY_TOPIC.get(topic.lower(), ())
+
+
+def get_presets_by_language(language: str):
+    """Get presets restricted to the given language."""
+    return _BY_LANGUAGE.get(language.lower(), ())
+
+
+def is_valid_preset(preset_id: str) -> bool:
+    """Check whether a preset ID exists."""
+    return preset_id in _PRESETS_BY_ID
+
+
+def is_known_topic(topic: str) -> bool:
+    """Check whether any preset filters on the given topic."""
+    return topic.lower() in _BY_TOPIC
+
+
+@functools.lru_cache(maxsize=128)
+def query_presets(
+    language: Optional[str] = None,
+    min_stars: int = 0,
+    since: Optional[str] = None
+) -> Tuple:
+    """
+    Get presets matching all of the given filters.
+
+    PRESETS never changes at runtime, so results are cached per set of filters.
+
+    Args:
+        language: Only presets restricted to this language
+        min_stars: Only presets requiring at least this many stars
+        since: Only presets using this time period
+
+    Returns:
+        Tuple of matching presets, in catalog order
+    """
+    candidates = get_presets_by_language(language) if language else PRESETS
+    return tuple(
+        preset for preset in candidates
+        if preset["config"].min_stars >= min_stars
+        and (since is None or preset["config"].since == since)
+    )
@@ -0,0 +1,15 @@
+"""
+Time period mappings shared by the web search module and the CLI
+"""
+
+# Period name -> length in days
+TIME_PERIODS = {
+    "1week": 7,
+    "2weeks": 14,
+    "1month": 30,
+    "3months": 90,
+    "6months": 180,
+    "1year": 365,
+    "2years": 730,
+    "5years": 1825,
+}
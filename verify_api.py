@@ -1,8 +1,49 @@
-import requests
-import json
+import http.client
+import orjson
 import sys
-
-BASE_URL = "http://localhost:5001/api/search"
+import time
+from operator import itemgetter
+
+HOST = "localhost"
+PORT = 5001
+SEARCH_PATH = "/api/search"
+BATCH_PATH = "/api/search/batch"
+
+# Retry transient failures (e.g. a server still warming up) with backoff
+RETRIES = 3
+BACKOFF_FACTOR = 0.2
+RETRY_STATUSES = (502, 503, 504)
+
+_FULL_NAME = itemgetter('full_name')
+
+# One keep-alive connection reused by every probe. Plain http.client
+# skips the requests middleware for these localhost calls.
+_CONNECTION = None
+
+def get_connection():
+    global _CONNECTION
+    if _CONNECTION is None:
+        _CONNECTION = http.client.HTTPConnection(HOST, PORT, timeout=30)
+    return _CONNECTION
+
+def post_json(path, payload):
+    body = orjson.dumps(payload)
+    for attempt in range(RETRIES + 1):
+        conn = get_connection()
+        try:
+            conn.request("POST", path, body=body,
+                         headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            status, data = response.status, response.read()
+        except (ConnectionError, http.client.HTTPException):
+            # Drop the broken socket; the next request reconnects
+            conn.close()
+            if attempt == RETRIES:
+                raise
+        else:
+            if status not in RETRY_STATUSES or attempt == RETRIES:
+                return status, data
+        time.sleep(BACKOFF_FACTOR * (2 ** attempt))
 
 def test_randomization():
     print("Testing Randomization...")
@@ -11,26 +52,29 @@ def test_randomization():
         "num_repos": 5
     }
 
+    # Both searches go out in one batch request
+    status, body = post_json(BATCH_PATH, {"requests": [payload, payload]})
+    if status != 200:
+        print(f"Batch request failed: {body.decode()}")
+        return False
+    data1, data2 = orjson.loads(body)['responses']
+
     # First request
-    response1 = requests.post(BASE_URL, json=payload)
-    if response1.status_code != 200:
-        print(f"Request 1 failed: {response1.text}")
+    if not data1.get('success'):
+        print(f"Request 1 failed: {data1.get('error')}")
         return False
-    data1 = response1.json()
     seed1 = data1.get('seed')
-    repos1 = [r['full_name'] for r in data1['repositories']]
+    repos1 = list(map(_FULL_NAME, data1['repositories']))
 
     print(f"Request 1 Seed: {seed1}")
     print(f"Request 1 Repos: {repos1}")
 
     # Second request (should generate new seed)
-    response2 = requests.post(BASE_URL, json=payload)
-    if response2.status_code != 200:
-        print(f"Request 2 failed: {response2.text}")
+    if not data2.get('success'):
+        print(f"Request 2 failed: {data2.get('error')}")
         return False
-    data2 = response2.json()
     seed2 = data2.get('seed')
-    repos2 = [r['full_name'] for r in data2['repositories']]
+    repos2 = list(map(_FULL_NAME, data2['repositories']))
 
     print(f"Request 2 Seed: {seed2}")
     print(f"Request 2 Repos: {repos2}")
@@ -54,18 +98,18 @@ def test_pagination():
         "language": "javascript",
         "num_repos": 5
     }
-    response1 = requests.post(BASE_URL, json=payload1)
-    if response1.status_code != 200:
-        print(f"Page 1 request failed: {response1.text}")
+    status1, body1 = post_json(SEARCH_PATH, payload1)
+    if status1 != 200:
+        print(f"Page 1 request failed: {body1.decode()}")
         return False
 
-    data1 = response1.json()
+    data1 = orjson.loads(body1)
     if not data1.get('success'):
         print(f"Page 1 API error: {data1.get('error')}")
         return False
 
     seed = data1.get('seed')
-    repos1 = [r['full_name'] for r in data1['repositories']]
+    repos1 = list(map(_FULL_NAME, data1['repositories']))
 
     print(f"Page 1 Seed: {seed}")
     print(f"Page 1 Repos: {repos1}")
@@ -77,17 +121,17 @@ def test_pagination():
         "page": 2,
         "seed": seed
     }
-    response2 = requests.post(BASE_URL, json=payload2)
-    if response2.status_code != 200:
-        print(f"Page 2 request failed: {response2.text}")
+    status2, body2 = post_json(SEARCH_PATH, payload2)
+    if status2 != 200:
+        print(f"Page 2 request failed: {body2.decode()}")
         return False
 
-    data2 = response2.json()
+    data2 = orjson.loads(body2)
     if not data2.get('success'):
         print(f"Page 2 API error: {data2.get('error')}")
         return False
 
-    repos2 = [r['full_name'] for r in data2['repositories']]
+    repos2 = list(map(_FULL_NAME, data2['repositories']))
 
     print(f"Page 2 Repos: {repos2}")
 
@@ -97,7 +141,8 @@ def test_pagination():
 
     # Check for overlap (should be none ideally, but with small result sets it's possible,
     # but with "javascript" there should be plenty)
-    overlap = set(repos1).intersection(set(repos2))
+    seen = set(repos1)
+    overlap = [r for r in repos2 if r in seen]
     if overlap:
         print(f"WARNING: Overlap found: {overlap}")
 